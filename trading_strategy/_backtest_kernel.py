@@ -0,0 +1,319 @@
+"""
+Compiled Backtest Kernel
+- Per-bar event loop of MovingAverageCrossover.backtest on raw NumPy arrays
+- Parallel driver for running many parameter combinations at once
+- Variants of the loop with the trailing stop / intraday flags fixed at compile time
+- Rolling means for the moving average signals
+- Compiled with Numba when available, plain Python otherwise
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional; the kernels still run as regular Python
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+NS_PER_DAY = 86_400_000_000_000
+
+# Exit reason codes stored in the trade arrays; EXIT_REASONS maps them back to labels
+EXIT_TAKE_PROFIT = 0
+EXIT_TRAILING_STOP = 1
+EXIT_STOP_LOSS = 2
+EXIT_DAY_CLOSE = 3
+EXIT_TIME_EXIT = 4
+EXIT_SIGNAL = 5
+EXIT_REASONS = ('take_profit', 'trailing_stop', 'stop_loss', 'day_close', 'time_exit', 'signal')
+
+
+@njit(cache=True)
+def rolling_means(values, windows):
+    """Trailing means of values over each window in windows, in one pass over values.
+
+    Matches Series.rolling(window, min_periods=1).mean() bit for bit, following
+    pandas' own kernel: Kahan-compensated running sums, NaNs skipped, and a run
+    of identical values returning that value exactly. Returns (len(windows), n).
+    """
+    n = len(values)
+    k = len(windows)
+    out = np.empty((k, n))
+
+    # Running state per window
+    nobs = np.zeros(k, np.int64)
+    sum_x = np.zeros(k)
+    neg_ct = np.zeros(k, np.int64)
+    compensation_add = np.zeros(k)
+    compensation_remove = np.zeros(k)
+    num_consecutive_same_value = np.zeros(k, np.int64)
+    prev_value = np.empty(k)
+    if n > 0:
+        prev_value[:] = values[0]
+
+    for i in range(n):
+        val = values[i]
+        for w in range(k):
+            # Drop the value leaving the window
+            if i >= windows[w]:
+                old = values[i - windows[w]]
+                if not np.isnan(old):
+                    nobs[w] -= 1
+                    y = -old - compensation_remove[w]
+                    t = sum_x[w] + y
+                    compensation_remove[w] = t - sum_x[w] - y
+                    sum_x[w] = t
+                    if old < 0:
+                        neg_ct[w] -= 1
+
+            # Add the new value
+            if not np.isnan(val):
+                nobs[w] += 1
+                y = val - compensation_add[w]
+                t = sum_x[w] + y
+                compensation_add[w] = t - sum_x[w] - y
+                sum_x[w] = t
+                if val < 0:
+                    neg_ct[w] += 1
+                if val == prev_value[w]:
+                    num_consecutive_same_value[w] += 1
+                else:
+                    num_consecutive_same_value[w] = 1
+                prev_value[w] = val
+
+            if nobs[w] > 0:
+                result = sum_x[w] / nobs[w]
+                if num_consecutive_same_value[w] >= nobs[w]:
+                    result = prev_value[w]
+                elif neg_ct[w] == 0 and result < 0:
+                    result = 0.0
+                elif neg_ct[w] == nobs[w] and result > 0:
+                    result = 0.0
+            else:
+                result = np.nan
+            out[w, i] = result
+
+    return out
+
+
+@njit(cache=True)
+def backtest_kernel(prices, signals, times, initial_capital, stop_loss_pct, take_profit_pct,
+                    position_size_pct, use_trailing_stop, trailing_stop_activation,
+                    trailing_stop_distance, intraday, days_to_hold):
+    """Run the per-bar backtest loop.
+
+    prices are adjusted closes, signals the crossover signals (1/-1/0) and times
+    the bar timestamps as int64 nanoseconds. Returns the portfolio value per bar
+    followed by the trade columns (entry_idx, exit_idx, entry_price, exit_price,
+    shares, pnl, pnl_pct, exit_reason) and the number of trades filled in them.
+    """
+    n = len(prices)
+    capital = initial_capital
+    position = 0
+    entry_price = 0.0
+    entry_idx = 0
+    last_trade_idx = -1
+    trailing_stop_price = 0.0  # For tracking trailing stop level
+
+    portfolio_value = np.empty(n)
+    portfolio_value[0] = initial_capital
+
+    # At most one exit per bar, so n rows always suffice
+    trade_entry_idx = np.empty(n, np.int64)
+    trade_exit_idx = np.empty(n, np.int64)
+    trade_entry_price = np.empty(n)
+    trade_exit_price = np.empty(n)
+    trade_shares = np.empty(n, np.int64)
+    trade_pnl = np.empty(n)
+    trade_pnl_pct = np.empty(n)
+    trade_reason = np.empty(n, np.int8)
+    k = 0
+
+    for i in range(1, n):
+        current_price = prices[i]
+        current_signal = signals[i]
+        exit_reason = -1
+
+        # Check for take profit or stop loss if in position
+        if position > 0:
+            pnl_pct = (current_price - entry_price) / entry_price
+            days_held = (times[i] - times[entry_idx]) // NS_PER_DAY
+
+            # Update trailing stop if using it and in profit
+            if use_trailing_stop and pnl_pct >= trailing_stop_activation:
+                # Only update if current price gives a higher stop price than previous
+                new_stop_price = current_price * (1 - trailing_stop_distance)
+                if new_stop_price > trailing_stop_price:
+                    trailing_stop_price = new_stop_price
+
+            if pnl_pct >= take_profit_pct:
+                exit_reason = EXIT_TAKE_PROFIT
+                trailing_stop_price = 0.0  # Reset trailing stop
+            # Trailing stop hit (only if activated)
+            elif use_trailing_stop and trailing_stop_price > 0 and current_price <= trailing_stop_price:
+                exit_reason = EXIT_TRAILING_STOP
+                trailing_stop_price = 0.0
+            elif pnl_pct <= -stop_loss_pct:
+                exit_reason = EXIT_STOP_LOSS
+                trailing_stop_price = 0.0
+            # For intraday, close position at end of day
+            elif intraday and days_held >= 1:
+                exit_reason = EXIT_DAY_CLOSE
+            # For swing trading, consider max hold time
+            elif not intraday and days_held >= days_to_hold:
+                exit_reason = EXIT_TIME_EXIT
+
+        # Check for buy signal
+        if exit_reason < 0 and current_signal == 1 and position == 0:
+            # Only trade if enough time has passed since last trade (avoid overtrading)
+            if last_trade_idx < 0 or (times[i] - times[last_trade_idx]) // NS_PER_DAY >= 1:
+                # Calculate position size (% of capital)
+                position_value = capital * position_size_pct
+                position = int(position_value / current_price)
+
+                if position > 0:
+                    entry_price = current_price
+                    entry_idx = i
+                    trailing_stop_price = 0.0  # Reset trailing stop for new position
+                    capital -= position * current_price
+        # Check for sell signal
+        elif exit_reason < 0 and current_signal == -1 and position > 0:
+            exit_reason = EXIT_SIGNAL
+            trailing_stop_price = 0.0
+
+        # Close the position and record the trade
+        if exit_reason >= 0:
+            capital += position * current_price
+
+            trade_entry_idx[k] = entry_idx
+            trade_exit_idx[k] = i
+            trade_entry_price[k] = entry_price
+            trade_exit_price[k] = current_price
+            trade_shares[k] = position
+            trade_pnl[k] = position * (current_price - entry_price)
+            trade_pnl_pct[k] = ((current_price - entry_price) / entry_price) * 100
+            trade_reason[k] = exit_reason
+            k += 1
+
+            position = 0
+            last_trade_idx = i
+
+        # Calculate portfolio value
+        portfolio_value[i] = capital + (position * current_price)
+
+    return (portfolio_value, trade_entry_idx, trade_exit_idx, trade_entry_price, trade_exit_price,
+            trade_shares, trade_pnl, trade_pnl_pct, trade_reason, k)
+
+
+def _specialize_backtest_kernel(use_trailing_stop, intraday):
+    """Return backtest_kernel with use_trailing_stop and intraday fixed.
+
+    Numba treats the closed-over flags as compile-time constants and inlines
+    backtest_kernel, so the branches they decide are compiled out of the loop.
+    """
+    @njit(cache=True)
+    def kernel(prices, signals, times, initial_capital, stop_loss_pct, take_profit_pct,
+               position_size_pct, trailing_stop_activation, trailing_stop_distance, days_to_hold):
+        return backtest_kernel(prices, signals, times, initial_capital, stop_loss_pct, take_profit_pct,
+                               position_size_pct, use_trailing_stop, trailing_stop_activation,
+                               trailing_stop_distance, intraday, days_to_hold)
+    return kernel
+
+
+# One specialized kernel per (use_trailing_stop, intraday) combination
+_SPECIALIZED_KERNELS = {(use_trailing_stop, intraday): _specialize_backtest_kernel(use_trailing_stop, intraday)
+                        for use_trailing_stop in (False, True) for intraday in (False, True)}
+
+
+def run_backtest_kernel(prices, signals, times, initial_capital, stop_loss_pct, take_profit_pct,
+                        position_size_pct, use_trailing_stop, trailing_stop_activation,
+                        trailing_stop_distance, intraday, days_to_hold):
+    """Run the backtest_kernel variant specialized for use_trailing_stop and intraday.
+
+    Takes the same arguments and returns the same arrays as backtest_kernel.
+    """
+    kernel = _SPECIALIZED_KERNELS[(bool(use_trailing_stop), bool(intraday))]
+    return kernel(prices, signals, times, initial_capital, stop_loss_pct, take_profit_pct,
+                  position_size_pct, trailing_stop_activation, trailing_stop_distance, days_to_hold)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _max_drawdown(portfolio_value):
+        """Largest peak-to-trough drop of portfolio_value, as a fraction of the peak."""
+        max_drawdown = 0.0
+        running_max = portfolio_value[0]
+        for i in range(len(portfolio_value)):
+            if portfolio_value[i] > running_max:
+                running_max = portfolio_value[i]
+            drawdown = (running_max - portfolio_value[i]) / running_max
+            if drawdown > max_drawdown:
+                max_drawdown = drawdown
+        return max_drawdown
+else:
+    def _max_drawdown(portfolio_value):
+        """Largest peak-to-trough drop of portfolio_value, as a fraction of the peak."""
+        running_max = np.maximum.accumulate(portfolio_value)
+        return max(np.max((running_max - portfolio_value) / running_max), 0.0)
+
+
+@njit(cache=True)
+def summary_metrics(portfolio_value, trade_pnl, n_trades, initial_capital):
+    """Return (total return %, Sharpe ratio, max drawdown %, win rate %) for one backtest.
+
+    The one definition of the sweep metrics, used by both fast_backtest and
+    batch_backtest_kernel; trade_pnl holds n_trades filled entries.
+    """
+    n = len(portfolio_value)
+    total_return = (portfolio_value[-1] - initial_capital) / initial_capital
+    annualized_return = (1 + total_return) ** (252 / n) - 1
+
+    sharpe_ratio = 0.0
+    max_drawdown = 0.0
+    if n > 1:
+        daily_returns = np.diff(portfolio_value) / portfolio_value[:-1]
+        volatility = np.std(daily_returns) * np.sqrt(252)
+        if volatility > 0:
+            sharpe_ratio = annualized_return / volatility
+        max_drawdown = _max_drawdown(portfolio_value)
+
+    win_rate = 0.0
+    if n_trades > 0:
+        win_rate = np.count_nonzero(trade_pnl[:n_trades] > 0) / n_trades
+
+    return total_return * 100, sharpe_ratio, max_drawdown * 100, win_rate * 100
+
+
+@njit(parallel=True, cache=True)
+def batch_backtest_kernel(prices, signals_grid, times, initial_capital, stop_loss_pcts,
+                          take_profit_pcts, position_size_pct, use_trailing_stop,
+                          trailing_stop_activation, trailing_stop_distance, intraday, days_to_hold):
+    """Run backtest_kernel for every row of signals_grid / stop_loss_pcts / take_profit_pcts in parallel.
+
+    The summary metrics are computed inside each parallel iteration, so only a
+    (n_combos, 4) array of (total return %, Sharpe ratio, max drawdown %,
+    win rate %) and the number of trades per combination are returned.
+    """
+    n_combos = signals_grid.shape[0]
+    metrics = np.empty((n_combos, 4))
+    n_trades = np.empty(n_combos, np.int64)
+
+    for c in prange(n_combos):
+        result = backtest_kernel(prices, signals_grid[c], times, initial_capital, stop_loss_pcts[c],
+                                 take_profit_pcts[c], position_size_pct, use_trailing_stop,
+                                 trailing_stop_activation, trailing_stop_distance, intraday, days_to_hold)
+        total_return, sharpe_ratio, max_drawdown, win_rate = summary_metrics(
+            result[0], result[6], result[9], initial_capital)
+        metrics[c, 0] = total_return
+        metrics[c, 1] = sharpe_ratio
+        metrics[c, 2] = max_drawdown
+        metrics[c, 3] = win_rate
+        n_trades[c] = result[9]
+
+    return metrics, n_trades
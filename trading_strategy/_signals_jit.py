@@ -0,0 +1,42 @@
+"""
+Compiled Paper-Trading Decision
+- Crossover signal and stop loss / take profit checks for one ticker's latest bar
+- Compiled with Numba when available, plain Python otherwise
+"""
+
+from trading_strategy._backtest_kernel import njit
+
+# Action codes returned by decide
+ACTION_HOLD = 0
+ACTION_BUY = 1
+ACTION_SELL_SIGNAL = 2
+ACTION_STOP_LOSS = 3
+ACTION_TAKE_PROFIT = 4
+
+
+@njit(cache=True)
+def decide(price, short_ma, long_ma, prev_short_ma, prev_long_ma, in_position,
+           entry_price, stop_loss_pct, take_profit_pct):
+    """Return (signal, action) for the latest bar.
+
+    signal follows MovingAverageCrossover.generate_signals (1/-1/0); the previous
+    moving averages are NaN when there is no earlier bar. entry_price is only
+    used when in_position is True.
+    """
+    signal = 0
+    if short_ma > long_ma and prev_short_ma <= prev_long_ma:
+        signal = 1
+    elif short_ma < long_ma and prev_short_ma >= prev_long_ma:
+        signal = -1
+
+    if signal == 1 and not in_position:
+        return signal, ACTION_BUY
+    if signal == -1 and in_position:
+        return signal, ACTION_SELL_SIGNAL
+    if in_position:
+        pnl_pct = (price - entry_price) / entry_price
+        if pnl_pct <= -stop_loss_pct:
+            return signal, ACTION_STOP_LOSS
+        if pnl_pct >= take_profit_pct:
+            return signal, ACTION_TAKE_PROFIT
+    return signal, ACTION_HOLD
@@ -8,7 +8,6 @@ Backtesting and Reporting Script for Trading Strategy
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import yfinance as yf
 from datetime import datetime, timedelta
 import os
 import sys # Add this line
@@ -22,16 +21,28 @@ if _project_root_directory not in sys.path:
 
 from pathlib import Path # This is line 14 in your full file
 from trading_strategy.strategy import MovingAverageCrossover # This is line 15 (the failing import)
+from trading_strategy._backtest_kernel import NUMBA_AVAILABLE, batch_backtest_kernel
 import argparse
-from tabulate import tabulate
+import functools
+from concurrent.futures import ProcessPoolExecutor
 
 def download_data(ticker, start_date, end_date, data_dir='data'):
     """Download historical data for a ticker symbol."""
+    # Hand out a copy so callers can't mutate the memoized frame
+    return _load_data(ticker, start_date, end_date, data_dir).copy()
+
+@functools.lru_cache(maxsize=8)
+def _load_data(ticker, start_date, end_date, data_dir):
+    """Load cached data from disk or generate it, memoized per (ticker, dates, dir)."""
     # Create data directory if it doesn't exist
     os.makedirs(data_dir, exist_ok=True)
     
     # File path for cached data
-    file_path = os.path.join(data_dir, f"{ticker}_{start_date}_{end_date}.csv")
+    file_path = os.path.join(data_dir, f"{ticker}_{start_date}_{end_date}.parquet")
+    
+    # Reuse the cached file if it was generated on a previous run
+    if os.path.exists(file_path):
+        return pd.read_parquet(file_path, engine='pyarrow')
     
     # For demonstration purposes, let's generate synthetic data
     # to avoid issues with the yfinance API
@@ -51,49 +62,47 @@ def download_data(ticker, start_date, end_date, data_dir='data'):
     daily_return_mean = 0.08 / 252
     daily_return_std = 0.15 / np.sqrt(252)
     
-    np.random.seed(42)  # For reproducibility
-    daily_returns = np.random.normal(daily_return_mean, daily_return_std, n_days)
+    rng = np.random.default_rng(42)  # PCG64 generator, seeded for reproducibility
+    daily_returns = rng.normal(daily_return_mean, daily_return_std, n_days)
     
     # Add a COVID crash simulation for Feb-Apr 2020
     covid_start = datetime(2020, 2, 15)
     covid_end = datetime(2020, 3, 23)
     covid_recovery = datetime(2020, 6, 1)
     
-    # Apply COVID effect to returns
-    for i, date in enumerate(date_range):
-        if covid_start <= date <= covid_end:
-            # Dramatic decline during COVID crash
-            daily_returns[i] -= 0.03
-        elif covid_end < date <= covid_recovery:
-            # Recovery phase
-            daily_returns[i] += 0.02
-    
+    # Apply COVID effect to returns; dates are sorted, so each phase is a contiguous slice
+    dates = date_range.values.astype('datetime64[D]')
+    crash_lo = np.searchsorted(dates, np.datetime64(covid_start, 'D'), side='left')
+    crash_hi = np.searchsorted(dates, np.datetime64(covid_end, 'D'), side='right')
+    recovery_hi = np.searchsorted(dates, np.datetime64(covid_recovery, 'D'), side='right')
+    daily_returns[crash_lo:crash_hi] -= 0.03  # Dramatic decline during COVID crash
+    daily_returns[crash_hi:recovery_hi] += 0.02  # Recovery phase
+
     price = 100 * (1 + np.cumsum(daily_returns))
+
+    # Create DataFrame from a single preallocated block of price columns
+    ohlc = np.empty((n_days, 5))
+    np.multiply(price, 0.99, out=ohlc[:, 0])
+    np.multiply(price, 1.01, out=ohlc[:, 1])
+    np.multiply(price, 0.98, out=ohlc[:, 2])
+    ohlc[:, 3] = price
+    ohlc[:, 4] = price
+    data = pd.DataFrame(ohlc, columns=['Open', 'High', 'Low', 'Close', 'Adj Close'], index=date_range, copy=False)
+    data['Volume'] = rng.integers(1000000, 10000000, n_days)
     
-    # Create DataFrame
-    data = pd.DataFrame({
-        'Open': price * 0.99,
-        'High': price * 1.01,
-        'Low': price * 0.98,
-        'Close': price,
-        'Adj Close': price,
-        'Volume': np.random.randint(1000000, 10000000, n_days)
-    }, index=date_range)
-    
-    # Save to file for caching
-    data.to_csv(file_path)
+    # Save to file for caching (binary columnar, much faster than CSV)
+    data.to_parquet(file_path, engine='pyarrow', compression='snappy')
     
     return data
 
+def _format_float(value):
+    """Format a table value with two decimals."""
+    return f"{value:.2f}"
+
 def print_colored_metrics(metrics):
     """Print metrics with colored output for key values."""
-    # Convert metrics to a list of lists for tabulate
-    table_data = []
-    for metric, value in metrics.items():
-        table_data.append([metric, f"{value:.2f}"])
-    
-    # Print the table
-    print(tabulate(table_data, headers=["Metric", "Value"], tablefmt="fancy_grid"))
+    # Render the whole table in one vectorized pandas call
+    print(pd.Series(metrics).to_frame('Value').to_string(float_format=_format_float))
 
 
 def run_backtest(ticker="SPY", start_date="2018-01-01", end_date="2023-01-01", 
@@ -141,53 +150,106 @@ def run_backtest(ticker="SPY", start_date="2018-01-01", end_date="2023-01-01",
     
     return strategy
 
-def evaluate_multiple_parameters(ticker="SPY", start_date="2018-01-01", end_date="2023-01-01", days_to_hold=60): # MODIFIED: Added days_to_hold
+# Price data shared with sweep worker processes, set once per worker by _init_sweep_worker
+_sweep_data = None
+
+def _init_sweep_worker(data):
+    """Store the price data in a worker process once instead of pickling it per task."""
+    global _sweep_data
+    _sweep_data = data
+
+def _sweep_strategy(short_window, long_window, stop_loss):
+    """Build the strategy configuration used for one optimization run."""
+    return MovingAverageCrossover(
+        short_window=short_window,
+        long_window=long_window,
+        initial_capital=10000, # Using a fixed capital for optimization runs for simplicity
+        stop_loss_pct=stop_loss,
+        take_profit_pct=stop_loss * 2,  # 2:1 reward-risk ratio
+        position_size_pct=0.2 # Using a fixed position size for optimization
+    )
+
+def _sweep_result(strategy, metrics):
+    """Collect the metrics reported for one parameter combination."""
+    return {
+        'short_window': strategy.short_window,
+        'long_window': strategy.long_window,
+        'stop_loss': strategy.stop_loss_pct,
+        'sharpe': metrics['Sharpe Ratio'],
+        'return': metrics['Total Return (%)'],
+        'max_dd': metrics['Max Drawdown (%)'],
+        'win_rate': metrics['Win Rate (%)']
+    }
+
+def _evaluate_combo(params):
+    """Backtest a single parameter combination and return its summary metrics."""
+    short_window, long_window, stop_loss, days_to_hold = params
+    strategy = _sweep_strategy(short_window, long_window, stop_loss)
+    
+    # Run backtest; metrics come straight from the equity curve of this pass
+    metrics = strategy.fast_backtest(_sweep_data, intraday=False, days_to_hold=days_to_hold)
+    
+    return _sweep_result(strategy, metrics)
+
+def _evaluate_combos_batched(data, combos):
+    """Backtest all parameter combinations in one call to the parallel Numba kernel."""
+    strategies = [_sweep_strategy(short_window, long_window, stop_loss)
+                  for short_window, long_window, stop_loss, _ in combos]
+    days_to_hold = combos[0][3]
+    
+    # Signals only depend on the MA windows, so compute them once per window pair
+    signals_by_window = {}
+    for strategy in strategies:
+        windows = (strategy.short_window, strategy.long_window)
+        if windows not in signals_by_window:
+            signals_by_window[windows] = strategy.generate_signals(data)['signal'].to_numpy(dtype=np.int8)
+    signals_grid = np.stack([signals_by_window[(s.short_window, s.long_window)] for s in strategies])
+    
+    # Stop loss and take profit vary per combination; everything else is shared
+    params = strategies[0]._kernel_params(False, days_to_hold)
+    stop_losses = np.array([s.stop_loss_pct for s in strategies], dtype=np.float64)
+    take_profits = np.array([s.take_profit_pct for s in strategies], dtype=np.float64)
+    
+    # Metrics are computed inside the kernel's parallel loop, one row per combination
+    metrics, _ = batch_backtest_kernel(
+        data['Adj Close'].to_numpy(dtype=np.float64), signals_grid,
+        MovingAverageCrossover._bar_times(data.index),
+        params[0], stop_losses, take_profits, *params[3:])
+    
+    metric_names = ('Total Return (%)', 'Sharpe Ratio', 'Max Drawdown (%)', 'Win Rate (%)')
+    return [
+        _sweep_result(strategy, dict(zip(metric_names, metrics[c])))
+        for c, strategy in enumerate(strategies)
+    ]
+
+def evaluate_multiple_parameters(ticker="SPY", start_date="2018-01-01", end_date="2023-01-01", days_to_hold=60, max_workers=None):
     """Test multiple parameter combinations and find the best one."""
     # Define parameter ranges to test
     short_windows = [5, 10, 15, 20, 25, 30]
     long_windows = [35, 40, 50, 60, 80, 100]
     stop_losses = [0.02, 0.03, 0.05, 0.07, 0.10]
     
-    results = []
-    
     # Download data once
     data = download_data(ticker, start_date, end_date)
     
     print(f"Evaluating {len(short_windows) * len(long_windows) * len(stop_losses)} parameter combinations...")
     
-    for short_window in short_windows:
-        for long_window in long_windows:
-            # Skip invalid combinations
-            if short_window >= long_window:
-                continue
-                
-            for stop_loss in stop_losses:
-                # Initialize strategy
-                strategy = MovingAverageCrossover(
-                    short_window=short_window,
-                    long_window=long_window,
-                    initial_capital=10000, # Using a fixed capital for optimization runs for simplicity
-                    stop_loss_pct=stop_loss,
-                    take_profit_pct=stop_loss * 2,  # 2:1 reward-risk ratio
-                    position_size_pct=0.2 # Using a fixed position size for optimization
-                )
-                
-                # Run backtest
-                strategy.backtest(data, intraday=False, days_to_hold=days_to_hold) # MODIFIED: Pass days_to_hold
-                
-                # Calculate metrics
-                metrics = strategy.calculate_metrics()
-                
-                # Store results
-                results.append({
-                    'short_window': short_window,
-                    'long_window': long_window,
-                    'stop_loss': stop_loss,
-                    'sharpe': metrics['Sharpe Ratio'],
-                    'return': metrics['Total Return (%)'],
-                    'max_dd': metrics['Max Drawdown (%)'],
-                    'win_rate': metrics['Win Rate (%)']
-                })
+    combos = [
+        (short_window, long_window, stop_loss, days_to_hold)
+        for short_window in short_windows
+        for long_window in long_windows
+        if short_window < long_window  # Skip invalid combinations
+        for stop_loss in stop_losses
+    ]
+    
+    if NUMBA_AVAILABLE:
+        # The compiled kernel spreads all combinations across threads in one call
+        results = _evaluate_combos_batched(data, combos)
+    else:
+        # Backtests are independent, so fan them out across processes
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                 initializer=_init_sweep_worker, initargs=(data,)) as executor:
+            results = list(executor.map(_evaluate_combo, combos, chunksize=8))
     
     # Convert to DataFrame
     results_df = pd.DataFrame(results)
@@ -197,7 +259,7 @@ def evaluate_multiple_parameters(ticker="SPY", start_date="2018-01-01", end_date
     
     # Print top 5 parameter combinations
     print("\nTOP 5 PARAMETER COMBINATIONS:")
-    print(tabulate(results_df.head(5), headers='keys', tablefmt='fancy_grid', floatfmt=".2f"))
+    print(results_df.head(5).to_string(float_format=_format_float))
     
     # Return best parameters
     best = results_df.iloc[0]
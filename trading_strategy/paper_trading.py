@@ -6,145 +6,361 @@ Paper Trading Simulation Script
 
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from datetime import datetime, timedelta
 import time
+import asyncio
 import os
 from trading_strategy.strategy import MovingAverageCrossover
-import argparse
-from tabulate import tabulate
-import json
+from trading_strategy._signals_jit import (decide, ACTION_BUY, ACTION_SELL_SIGNAL,
+                                           ACTION_STOP_LOSS, ACTION_TAKE_PROFIT)
+import orjson
+import pyarrow.feather as feather
+from collections import deque, namedtuple
+from functools import lru_cache
+
+# One logged trade; buys have no P&L, so their pnl / pnl_pct are NaN
+Trade = namedtuple('Trade', ['date', 'action', 'ticker', 'price', 'shares', 'value',
+                             'pnl', 'pnl_pct', 'reason'])
+
+
+@lru_cache(maxsize=1024)
+def _format_date(date):
+    """Format a bar date as YYYY-MM-DD, reusing the string for repeated dates."""
+    return date.strftime('%Y-%m-%d')
+
 
 class PaperTrader:
     """Paper trading simulator for automated strategy execution."""
     
+    # Most recent trades kept in memory; the full history lives on disk
+    max_inmem_trades = 10_000
+    
+    # Cached bars refetched on every check to detect Yahoo revising the history
+    cache_overlap_bars = 5
+    
     def __init__(self, strategy, ticker, initial_capital=10000, data_dir='data'):
         self.strategy = strategy
-        self.ticker = ticker
+        # A single symbol or a list of symbols traded from the same capital
+        self.tickers = [ticker] if isinstance(ticker, str) else list(ticker)
+        self.ticker = "_".join(self.tickers)
         self.initial_capital = initial_capital
         self.data_dir = data_dir
         self.positions = {}
-        self.trade_log = []
+        self.trade_log = deque(maxlen=self.max_inmem_trades)  # Trades made this session
+        self._unsaved_trades = []  # Trades not yet written to disk
         self.capital = initial_capital
         
         # Create data directory
         os.makedirs(data_dir, exist_ok=True)
         
         # File path for storing positions
-        self.positions_file = os.path.join(data_dir, f"{ticker}_positions.json")
-        self.trade_log_file = os.path.join(data_dir, f"{ticker}_trade_log.csv")
+        self.positions_file = os.path.join(data_dir, f"{self.ticker}_positions.json")
+        # Trade history is an append-only directory of feather fragments, one per save
+        self.trade_log_dir = os.path.join(data_dir, f"{self.ticker}_trade_log")
+        
+        # On-disk cache of daily bars per symbol so each check only fetches new ones
+        self._cache_paths = {symbol: os.path.join(data_dir, f"{symbol}_bars.feather")
+                             for symbol in self.tickers}
+        # Downloads made during the current check, keyed by days; cleared at the start
+        # of every check so a check never sees an earlier check's prices
+        self._check_downloads = {}
+        
+        # Running moving-average state per ticker, see _latest_mas
+        self._ma_state = {}
+        
+        # Compile (or load the cached build of) the decision function before the first check
+        decide(1.0, 1.0, 1.0, np.nan, np.nan, False, 0.0, 0.0, 0.0)
         
         # Load existing positions if any
         self.load_positions()
+        
+        # Positions are only rewritten after a trade (or once to create the file)
+        self._positions_dirty = not os.path.exists(self.positions_file)
     
     def load_positions(self):
         """Load positions from file if it exists."""
         if os.path.exists(self.positions_file):
-            with open(self.positions_file, 'r') as f:
-                positions_data = json.load(f)
-                self.positions = positions_data['positions']
-                self.capital = positions_data['capital']
-                
-                # Convert string dates to datetime
-                for symbol, pos in self.positions.items():
-                    if 'entry_date' in pos:
-                        pos['entry_date'] = datetime.fromisoformat(pos['entry_date'])
-        
-        # Load trade log if exists
-        if os.path.exists(self.trade_log_file):
-            self.trade_log = pd.read_csv(self.trade_log_file)
+            with open(self.positions_file, 'rb') as f:
+                positions_data = orjson.loads(f.read())
+            self.positions = positions_data['positions']
+            self.capital = positions_data['capital']
+            
+            # Convert string dates to datetime
+            for symbol, pos in self.positions.items():
+                if 'entry_date' in pos:
+                    pos['entry_date'] = datetime.fromisoformat(pos['entry_date'])
+        self._build_position_arrays()
+    
+    def load_trade_history(self):
+        """Return the full trade history on disk as a DataFrame (memory-mapped reads).
+        
+        Includes a trade log written as a single CSV by older versions.
+        """
+        frames = []
+        legacy_csv = self.trade_log_dir + '.csv'
+        if os.path.exists(legacy_csv):
+            frames.append(pd.read_csv(legacy_csv))
+        if os.path.isdir(self.trade_log_dir):
+            for name in sorted(os.listdir(self.trade_log_dir)):
+                if name.endswith('.feather'):
+                    path = os.path.join(self.trade_log_dir, name)
+                    frames.append(feather.read_table(path, memory_map=True).to_pandas())
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+    
+    def _build_position_arrays(self):
+        """Mirror the positions dict as parallel arrays for vectorized valuation."""
+        self._syms = list(self.positions)
+        self._shares = np.array([pos['shares'] for pos in self.positions.values()], dtype=float)
+        self._entry_px = np.array([pos['entry_price'] for pos in self.positions.values()], dtype=float)
+        self._cost = np.array([pos['cost'] for pos in self.positions.values()], dtype=float)
     
     def save_positions(self):
-        """Save positions to file."""
-        # Convert datetime to string for JSON serialization
-        positions_copy = {}
-        for symbol, pos in self.positions.items():
-            positions_copy[symbol] = pos.copy()
-            if 'entry_date' in positions_copy[symbol]:
-                positions_copy[symbol]['entry_date'] = positions_copy[symbol]['entry_date'].isoformat()
-        
-        positions_data = {
-            'positions': positions_copy,
-            'capital': self.capital
-        }
-        
-        with open(self.positions_file, 'w') as f:
-            json.dump(positions_data, f, indent=4)
-        
-        # Save trade log
-        if isinstance(self.trade_log, list) and len(self.trade_log) > 0:
-            pd.DataFrame(self.trade_log).to_csv(self.trade_log_file, index=False)
-        elif isinstance(self.trade_log, pd.DataFrame):
-            self.trade_log.to_csv(self.trade_log_file, index=False)
+        """Atomically save new trades and, if they changed, positions to file."""
+        # Append the trades made since the last save as a new fragment (written to a
+        # temporary path and moved into place, so no partial file is ever left behind)
+        if self._unsaved_trades:
+            os.makedirs(self.trade_log_dir, exist_ok=True)
+            fragment = os.path.join(self.trade_log_dir, f"{time.time_ns()}.feather")
+            tmp_file = fragment + '.tmp'
+            pd.DataFrame(self._unsaved_trades, columns=Trade._fields).to_feather(tmp_file, compression='zstd')
+            os.replace(tmp_file, fragment)
+            self._unsaved_trades = []
+        
+        if self._positions_dirty:
+            positions_data = {
+                'positions': self.positions,
+                'capital': self.capital
+            }
+            
+            # orjson writes datetimes and NumPy scalars natively; pandas Timestamps
+            # go through the default hook as plain ISO datetimes
+            tmp_file = self.positions_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(positions_data, default=datetime.isoformat,
+                                     option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            # Trades are written before positions, so saved positions are always explained by the log
+            os.replace(tmp_file, self.positions_file)
+            self._positions_dirty = False
     
     def get_current_data(self, lookback_days=100):
-        """Get current market data."""
+        """Return ticker -> lookback-window bars, downloading only what the local cache lacks.
+        
+        Tickers with no bars at all are left out with a warning.
+        """
+        if not self.tickers:
+            return {}
         end_date = datetime.now()
         start_date = end_date - timedelta(days=lookback_days)
         
-        # Download data
-        data = yf.download(self.ticker, start=start_date, end=end_date)
+        # Refetch the last few cached bars too; the newest may still have been forming
+        cached = {symbol: self._load_bar_cache(symbol) for symbol in self.tickers}
+        fetch_start = min(
+            frame.index[-min(len(frame), self.cache_overlap_bars)]
+            if frame is not None and len(frame) > 0 else pd.Timestamp(start_date)
+            for frame in cached.values()
+        )
+        new_bars = self._extract_adj_close(self._download(fetch_start, end_date))
+        
+        # Drop the caches whose already-settled bars no longer match the fresh download
+        revised = [symbol for symbol in self.tickers
+                   if self._history_revised(cached[symbol], new_bars.get(symbol))]
+        if revised:
+            print(f"Adjusted prices revised for {', '.join(revised)}, refetching their history.")
+            full_bars = self._extract_adj_close(self._download(start_date, end_date))
+            for symbol in revised:
+                cached[symbol] = None
+                new_bars[symbol] = full_bars.get(symbol)
+                self._ma_state.pop(symbol, None)  # Its running sums hold the old prices
+        
+        data = {}
+        for symbol in self.tickers:
+            new_data = new_bars.get(symbol)
+            frames = [frame for frame in (cached[symbol], new_data) if frame is not None]
+            bars = pd.concat(frames) if frames else None
+            if bars is not None:
+                bars = bars[~bars.index.duplicated(keep='last')]
+                # Keep the same lookback window as a full download would return
+                bars = bars[bars.index >= pd.Timestamp(start_date)]
+            if bars is None or len(bars) == 0:
+                print(f"Warning: no data for {symbol}, skipping it this check.")
+                continue
+            
+            self._save_bar_cache(symbol, bars)
+            data[symbol] = bars
         
         return data
     
+    @staticmethod
+    def _extract_adj_close(multi_df):
+        """Split a grouped download into ticker -> float32 Adj Close frame (the only column used)."""
+        return {symbol: multi_df[symbol][['Adj Close']].dropna(how='all').astype(np.float32)
+                for symbol in multi_df.columns.get_level_values(0).unique()}
+    
+    # Yahoo back-adjusts the whole Adj Close history after a dividend or split, which
+    # rescales every bar before the ex-date, including the cache_overlap_bars refetched
+    # on each check. A change there means the cache must be dropped and refetched.
+    @staticmethod
+    def _history_revised(cached, new_data):
+        """Whether new_data changed any cached bar other than the last (possibly forming) one."""
+        if cached is None or new_data is None or len(cached) < 2:
+            return False
+        settled = cached.index[:-1].intersection(new_data.index)
+        if len(settled) == 0:
+            return False
+        return not np.allclose(cached.loc[settled, 'Adj Close'], new_data.loc[settled, 'Adj Close'],
+                               rtol=1e-5, atol=0)
+    
+    def _download(self, start, end):
+        """Download daily bars for all tickers in one request, grouped by ticker.
+        
+        Repeat requests for the same days within one check reuse its response
+        instead of hitting Yahoo again.
+        """
+        import yfinance as yf  # Imported on first use; it is slow to import
+        
+        key = (pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize())
+        if key not in self._check_downloads:
+            self._check_downloads[key] = yf.download(self.tickers, start=start, end=end, group_by='ticker',
+                                                     threads=True, auto_adjust=False, progress=False)
+        return self._check_downloads[key]
+    
+    def _load_bar_cache(self, symbol):
+        """Load cached bars for a ticker from disk, or None if there is no cache yet."""
+        if not os.path.exists(self._cache_paths[symbol]):
+            return None
+        bars = pd.read_feather(self._cache_paths[symbol], columns=['Date', 'Adj Close'])
+        return bars.set_index('Date').astype(np.float32)
+    
+    def _save_bar_cache(self, symbol, data):
+        """Write a ticker's bars to its feather cache (feather needs a plain column index)."""
+        data.rename_axis('Date').reset_index().to_feather(self._cache_paths[symbol])
+    
     def check_for_signals(self):
         """Check for trading signals and execute paper trades."""
         print(f"\n--- Checking for signals on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---")
         
-        # Get current market data
-        data = self.get_current_data()
+        # Get current market data for every ticker in one request, never reusing
+        # an earlier check's download
+        self._check_downloads = {}
+        data_by_ticker = self.get_current_data()
+        
+        # Tickers without data this check are skipped; their open positions are
+        # still valued below through _position_price
+        tickers = [ticker for ticker in self.tickers if ticker in data_by_ticker]
+        
+        # Update moving averages for all tickers, then act on them in ticker order so
+        # sizing positions off the shared capital stays deterministic. The network I/O
+        # already happened in the single batched download; what is left is a few
+        # O(1) running-sum updates per ticker, which threads cannot speed up
+        latest = [self._latest_mas(ticker, data_by_ticker[ticker]) for ticker in tickers]
+        
+        prices = {}
+        for ticker, result in zip(tickers, latest):
+            if result is None:
+                continue
+            latest_date, latest_price, *mas = result
+            self._check_one(ticker, latest_date, latest_price, mas)
+            prices[ticker] = latest_price
+        
+        # Save positions
+        self.save_positions()
+        
+        # Print portfolio status, valued at the prices just fetched
+        self.print_portfolio_status(prices)
+    
+    def _latest_mas(self, ticker, data):
+        """Return (date, price, short_ma, long_ma, prev_short_ma, prev_long_ma) for a ticker's latest bar.
         
-        # Generate signals
-        signals_data = self.strategy.generate_signals(data)
+        The moving averages are kept as running sums over fixed-size windows, so
+        each check only folds in the bars that changed instead of recomputing
+        generate_signals over the whole lookback window. Returns None when data
+        has no bars.
+        """
+        if len(data) == 0:
+            return None
+        prices = data['Adj Close']
+        state = self._ma_state.get(ticker)
         
-        # Get latest data point
-        latest_data = signals_data.iloc[-1]
-        prev_data = signals_data.iloc[-2]
-        latest_date = latest_data.name
-        latest_price = latest_data['Adj Close']
-        latest_signal = latest_data['signal']
+        if state is None or state['date'] not in prices.index:
+            # First check (or the cached history no longer overlaps): seed from the full window
+            state = {
+                'short_buf': deque(maxlen=self.strategy.short_window), 'short_sum': 0.0,
+                'long_buf': deque(maxlen=self.strategy.long_window), 'long_sum': 0.0,
+                'prev_short_ma': np.nan, 'prev_long_ma': np.nan
+            }
+            new_prices = prices
+        else:
+            # The last seen bar may still have been forming, so refresh it first
+            self._replace_last_price(state, float(prices[state['date']]))
+            new_prices = prices[prices.index > state['date']]
         
-        print(f"Latest data: {latest_date.strftime('%Y-%m-%d')}")
+        for price in new_prices.to_numpy(dtype=float):
+            self._push_price(state, price)
+        state['date'] = prices.index[-1]
+        self._ma_state[ticker] = state
+        
+        short_ma = state['short_sum'] / len(state['short_buf'])
+        long_ma = state['long_sum'] / len(state['long_buf'])
+        return (prices.index[-1], float(prices.iat[-1]), short_ma, long_ma,
+                state['prev_short_ma'], state['prev_long_ma'])
+    
+    @staticmethod
+    def _push_price(state, price):
+        """Append a new bar's price to the MA windows in O(1)."""
+        if state['short_buf']:
+            state['prev_short_ma'] = state['short_sum'] / len(state['short_buf'])
+            state['prev_long_ma'] = state['long_sum'] / len(state['long_buf'])
+        for window in ('short', 'long'):
+            buf = state[f'{window}_buf']
+            if len(buf) == buf.maxlen:
+                state[f'{window}_sum'] -= buf[0]
+            buf.append(price)
+            state[f'{window}_sum'] += price
+    
+    @staticmethod
+    def _replace_last_price(state, price):
+        """Overwrite the most recent bar's price in the MA windows in O(1)."""
+        for window in ('short', 'long'):
+            buf = state[f'{window}_buf']
+            state[f'{window}_sum'] += price - buf[-1]
+            buf[-1] = price
+    
+    def _check_one(self, ticker, latest_date, latest_price, mas):
+        """Act on one ticker's latest moving averages and execute paper trades."""
+        position = self.positions.get(ticker)
+        entry_price = position['entry_price'] if position is not None else 0.0
+        latest_signal, action = decide(latest_price, *mas, position is not None, entry_price,
+                                       self.strategy.stop_loss_pct, self.strategy.take_profit_pct)
+        
+        print(f"\n{ticker} latest data: {_format_date(latest_date)}")
         print(f"Price: ${latest_price:.2f}")
         print(f"Signal: {latest_signal}")
         
-        # Check for buy signal
-        if latest_signal == 1 and self.ticker not in self.positions:
-            self.execute_buy(latest_date, latest_price)
+        # Buy signal
+        if action == ACTION_BUY:
+            self.execute_buy(ticker, latest_date, latest_price)
         
-        # Check for sell signal
-        elif latest_signal == -1 and self.ticker in self.positions:
-            self.execute_sell(latest_date, latest_price, reason="signal")
+        # Sell signal
+        elif action == ACTION_SELL_SIGNAL:
+            self.execute_sell(ticker, latest_date, latest_price, reason="signal")
         
-        # Check stop loss and take profit for existing position
-        elif self.ticker in self.positions:
-            position = self.positions[self.ticker]
-            entry_price = position['entry_price']
-            
-            # Calculate current P&L
+        # Stop loss and take profit for existing position
+        elif position is not None:
             pnl_pct = (latest_price - entry_price) / entry_price
-            
             print(f"Current P&L: {pnl_pct*100:.2f}%")
             
-            # Check stop loss
-            if pnl_pct <= -self.strategy.stop_loss_pct:
-                self.execute_sell(latest_date, latest_price, reason="stop_loss")
-            
-            # Check take profit
-            elif pnl_pct >= self.strategy.take_profit_pct:
-                self.execute_sell(latest_date, latest_price, reason="take_profit")
+            if action == ACTION_STOP_LOSS:
+                self.execute_sell(ticker, latest_date, latest_price, reason="stop_loss")
+            elif action == ACTION_TAKE_PROFIT:
+                self.execute_sell(ticker, latest_date, latest_price, reason="take_profit")
         
         # No position and no signal
         else:
             print("No action needed.")
-        
-        # Save positions
-        self.save_positions()
-        
-        # Print portfolio status
-        self.print_portfolio_status(latest_price)
     
-    def execute_buy(self, date, price):
+    def execute_buy(self, ticker, date, price):
         """Execute a paper buy trade."""
         # Calculate position size
         position_value = self.capital * self.strategy.position_size_pct
@@ -159,39 +375,29 @@ class PaperTrader:
                 self.capital -= cost
                 
                 # Record position
-                self.positions[self.ticker] = {
+                self._positions_dirty = True
+                self.positions[ticker] = {
                     'entry_date': date,
                     'entry_price': price,
                     'shares': shares,
                     'cost': cost
                 }
+                self._build_position_arrays()
                 
                 # Log trade
-                trade = {
-                    'date': date.strftime('%Y-%m-%d'),
-                    'action': 'BUY',
-                    'ticker': self.ticker,
-                    'price': price,
-                    'shares': shares,
-                    'value': cost,
-                    'reason': 'signal'
-                }
+                self._log_trade(Trade(_format_date(date), 'BUY', ticker, price, shares, cost,
+                                      np.nan, np.nan, 'signal'))
                 
-                if isinstance(self.trade_log, list):
-                    self.trade_log.append(trade)
-                else:
-                    self.trade_log = self.trade_log.append(trade, ignore_index=True)
-                
-                print(f"\n>>> BUY ALERT: {shares} shares of {self.ticker} @ ${price:.2f} = ${cost:.2f}")
+                print(f"\n>>> BUY ALERT: {shares} shares of {ticker} @ ${price:.2f} = ${cost:.2f}")
             else:
-                print(f"Not enough capital to buy {shares} shares of {self.ticker}.")
+                print(f"Not enough capital to buy {shares} shares of {ticker}.")
         else:
-            print(f"Not enough capital to buy at least 1 share of {self.ticker}.")
+            print(f"Not enough capital to buy at least 1 share of {ticker}.")
     
-    def execute_sell(self, date, price, reason="signal"):
+    def execute_sell(self, ticker, date, price, reason="signal"):
         """Execute a paper sell trade."""
-        if self.ticker in self.positions:
-            position = self.positions[self.ticker]
+        if ticker in self.positions:
+            position = self.positions[ticker]
             shares = position['shares']
             entry_price = position['entry_price']
             cost = position['cost']
@@ -203,58 +409,44 @@ class PaperTrader:
             
             # Update capital
             self.capital += proceeds
+            self._positions_dirty = True
             
             # Log trade
-            trade = {
-                'date': date.strftime('%Y-%m-%d'),
-                'action': 'SELL',
-                'ticker': self.ticker,
-                'price': price,
-                'shares': shares,
-                'value': proceeds,
-                'pnl': pnl,
-                'pnl_pct': pnl_pct,
-                'reason': reason
-            }
-            
-            if isinstance(self.trade_log, list):
-                self.trade_log.append(trade)
-            else:
-                self.trade_log = self.trade_log.append(trade, ignore_index=True)
+            self._log_trade(Trade(_format_date(date), 'SELL', ticker, price, shares, proceeds,
+                                  pnl, pnl_pct, reason))
             
             # Remove position
-            del self.positions[self.ticker]
+            del self.positions[ticker]
+            self._build_position_arrays()
             
-            print(f"\n>>> SELL ALERT: {shares} shares of {self.ticker} @ ${price:.2f} = ${proceeds:.2f}")
+            print(f"\n>>> SELL ALERT: {shares} shares of {ticker} @ ${price:.2f} = ${proceeds:.2f}")
             print(f"P&L: ${pnl:.2f} ({pnl_pct:.2f}%)")
             print(f"Reason: {reason}")
     
-    def print_portfolio_status(self, current_price=None):
-        """Print current portfolio status."""
-        # Calculate total portfolio value
-        portfolio_value = self.capital
-        
-        # Add value of open positions
-        for symbol, pos in self.positions.items():
-            # Get current price if not provided
-            if current_price is None:
-                ticker_data = yf.Ticker(symbol).history(period='1d')
-                current_price = ticker_data['Close'].iloc[-1]
-            
-            position_value = pos['shares'] * current_price
-            portfolio_value += position_value
-            
-            # Calculate P&L
-            pnl = position_value - pos['cost']
-            pnl_pct = (current_price - pos['entry_price']) / pos['entry_price'] * 100
-            
-            # Print position details
+    def _log_trade(self, trade):
+        """Record a trade in memory and queue it for the next save."""
+        self.trade_log.append(trade)
+        self._unsaved_trades.append(trade)
+    
+    def print_portfolio_status(self, prices=None):
+        """Print current portfolio status, valuing positions at the given ticker -> price dict."""
+        # Only look a price up when it was not passed in
+        current_px = np.array([self._position_price(symbol, prices) for symbol in self._syms], dtype=float)
+        
+        # Value all open positions at once
+        values = self._shares * current_px
+        pnl = values - self._cost
+        pnl_pct = (current_px / self._entry_px - 1) * 100
+        portfolio_value = self.capital + values.sum()
+        
+        # Print position details
+        for i, symbol in enumerate(self._syms):
             print(f"\nOpen position: {symbol}")
-            print(f"Shares: {pos['shares']}")
-            print(f"Entry price: ${pos['entry_price']:.2f}")
-            print(f"Current price: ${current_price:.2f}")
-            print(f"Current value: ${position_value:.2f}")
-            print(f"Unrealized P&L: ${pnl:.2f} ({pnl_pct:.2f}%)")
+            print(f"Shares: {self._shares[i]:.0f}")
+            print(f"Entry price: ${self._entry_px[i]:.2f}")
+            print(f"Current price: ${current_px[i]:.2f}")
+            print(f"Current value: ${values[i]:.2f}")
+            print(f"Unrealized P&L: ${pnl[i]:.2f} ({pnl_pct[i]:.2f}%)")
         
         # Print overall portfolio status
         print("\nPORTFOLIO SUMMARY:")
@@ -265,11 +457,24 @@ class PaperTrader:
         # Calculate return
         total_return = (portfolio_value - self.initial_capital) / self.initial_capital * 100
         print(f"Total return: {total_return:.2f}%")
+    
+    @staticmethod
+    def _position_price(symbol, prices):
+        """Return a symbol's price from prices, falling back to its latest daily close."""
+        if prices is not None and symbol in prices:
+            return prices[symbol]
+        import yfinance as yf
+        ticker_data = yf.Ticker(symbol).history(period='1d')
+        return float(ticker_data['Close'].iat[-1])
+
 
+async def run_paper_trading(ticker="SPY", initial_capital=10000, interval=60, 
+                           short_window=20, long_window=50, stop_loss=0.05, take_profit=0.1):
+    """Run paper trading simulation with specified parameters.
 
-def run_paper_trading(ticker="SPY", initial_capital=10000, interval=60, 
-                     short_window=20, long_window=50, stop_loss=0.05, take_profit=0.1):
-    """Run paper trading simulation with specified parameters."""
+    ticker may be a single symbol or a list of symbols sharing the same capital.
+    Checks run on interval boundaries; start it with asyncio.run(run_paper_trading(...)).
+    """
     # Initialize strategy
     strategy = MovingAverageCrossover(
         short_window=short_window,
@@ -283,20 +488,24 @@ def run_paper_trading(ticker="SPY", initial_capital=10000, interval=60,
     # Initialize paper trader
     trader = PaperTrader(strategy, ticker, initial_capital)
     
-    # Run initial check
-    trader.check_for_signals()
+    # Run initial check; checks block on downloads, so run them off the event loop
+    await asyncio.to_thread(trader.check_for_signals)
     
-    # Continue checking at specified interval
+    # Continue checking once per interval, aligned to the interval boundaries
     while True:
-        print(f"\nWaiting for {interval} seconds before next check...")
-        time.sleep(interval)  # Wait for the specified interval
-        trader.check_for_signals()
+        now = time.time()
+        next_check = (now // interval + 1) * interval
+        print(f"\nWaiting {next_check - now:.0f} seconds until next check...")
+        await asyncio.sleep(next_check - now)
+        await asyncio.to_thread(trader.check_for_signals)
 
 
 if __name__ == "__main__":
+    import argparse
+    
     parser = argparse.ArgumentParser(description='Run paper trading for Moving Average Crossover strategy')
     
-    parser.add_argument('--ticker', type=str, default='SPY', help='Ticker symbol to trade')
+    parser.add_argument('--ticker', type=str, nargs='+', default='SPY', help='Ticker symbol(s) to trade')
     parser.add_argument('--capital', type=float, default=10000, help='Initial capital')
     parser.add_argument('--interval', type=int, default=60, help='Check interval in seconds')
     parser.add_argument('--short', type=int, default=20, help='Short moving average window')
@@ -306,7 +515,7 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
-    run_paper_trading(
+    asyncio.run(run_paper_trading(
         ticker=args.ticker,
         initial_capital=args.capital,
         interval=args.interval,
@@ -314,4 +523,4 @@ if __name__ == "__main__":
         long_window=args.long,
         stop_loss=args.stop,
         take_profit=args.take
-    )
+    ))
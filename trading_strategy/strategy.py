@@ -7,7 +7,6 @@ Trading Strategy Implementation
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import yfinance as yf
 from datetime import datetime, timedelta
 from sklearn.metrics import mean_squared_error
 import os
@@ -17,6 +16,8 @@ from tqdm import tqdm
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import warnings
+from trading_strategy._backtest_kernel import (NUMBA_AVAILABLE, run_backtest_kernel, rolling_means,
+                                              summary_metrics, EXIT_REASONS)
 
 warnings.filterwarnings('ignore')
 
@@ -27,6 +28,14 @@ class MovingAverageCrossover:
     - Sell when short-term MA crosses below long-term MA
     """
     
+    # Longest line the plots draw per series; longer series are downsampled
+    plot_max_points = 5000
+    
+    # Storage dtype of the Portfolio_Value and Daily_Return columns built by backtest();
+    # np.float32 halves their memory for the full report (cash is still tracked in
+    # float64). fast_backtest and the sweeps keep no portfolio frame and ignore it
+    portfolio_dtype = np.float64
+    
     def __init__(self, short_window=30, long_window=70, initial_capital=10000, 
                  stop_loss_pct=0.07, take_profit_pct=0.20, position_size_pct=0.5,
                  use_trailing_stop=True, trailing_stop_activation=0.06, trailing_stop_distance=0.04):
@@ -43,258 +52,117 @@ class MovingAverageCrossover:
         self.positions = {}
         self.daily_returns = []
         self.equity = []
+        self._dd_cache = None  # (portfolio, drawdowns result), see calculate_drawdowns
 
     def generate_signals(self, data):
-        """Generate trading signals based on moving average crossover."""
-        # Create a copy of data to avoid modifying the original
-        df = data.copy()
-        
-        # Calculate moving averages
-        df['short_ma'] = df['Adj Close'].rolling(window=self.short_window, min_periods=1).mean()
-        df['long_ma'] = df['Adj Close'].rolling(window=self.long_window, min_periods=1).mean()
+        """Generate trading signals based on moving average crossover.
+
+        Returns a new frame with short_ma, long_ma and signal columns added; the
+        input frame is left unchanged.
+        """
+        # Calculate moving averages; the compiled kernel computes both in one pass and
+        # matches pandas exactly, but without Numba pandas' rolling mean is faster
+        if NUMBA_AVAILABLE:
+            windows = np.array([self.short_window, self.long_window], dtype=np.int64)
+            short_ma, long_ma = rolling_means(data['Adj Close'].to_numpy(dtype=np.float64), windows)
+        else:
+            short_ma = data['Adj Close'].rolling(window=self.short_window, min_periods=1).mean().to_numpy()
+            long_ma = data['Adj Close'].rolling(window=self.long_window, min_periods=1).mean().to_numpy()
         
-        # Generate signals
-        df['signal'] = 0
+        # Generate signals, comparing each bar with the previous one through array slices
+        signal = np.zeros(len(data), dtype=np.int8)
         # Buy signal (short MA crosses above long MA)
-        df.loc[(df['short_ma'] > df['long_ma']) & (df['short_ma'].shift(1) <= df['long_ma'].shift(1)), 'signal'] = 1
+        signal[1:][(short_ma[1:] > long_ma[1:]) & (short_ma[:-1] <= long_ma[:-1])] = 1
         # Sell signal (short MA crosses below long MA)
-        df.loc[(df['short_ma'] < df['long_ma']) & (df['short_ma'].shift(1) >= df['long_ma'].shift(1)), 'signal'] = -1
+        signal[1:][(short_ma[1:] < long_ma[1:]) & (short_ma[:-1] >= long_ma[:-1])] = -1
         
-        return df
+        # Attach the new columns to a new frame; under pandas copy-on-write (the default
+        # from pandas 3) the input's other columns are shared instead of deep-copied
+        return data.assign(short_ma=short_ma, long_ma=long_ma, signal=signal)
 
     def backtest(self, data, intraday=False, days_to_hold=None):
         """Run backtest on the strategy."""
         df = self.generate_signals(data)
-        capital = self.initial_capital
-        position = 0
-        entry_price = 0
-        entry_date = None
-        last_trade_date = None
-        trailing_stop_price = 0  # For tracking trailing stop level
+        (portfolio_value, entry_idx, exit_idx, entry_price, exit_price,
+         shares, pnl, pnl_pct, exit_reason, n_trades) = self._run_kernel(df, intraday, days_to_hold)
         
-        # Set default days_to_hold if None
-        if days_to_hold is None:
-            days_to_hold = 60  # Default to 60 days if not specified
-        
-        # For tracking portfolio value
-        portfolio_value = [self.initial_capital]
-        dates = [df.index[0]]
-        
-        # For tracking trades
-        all_trades = []
+        # Calculate daily returns (same arithmetic as pct_change, straight on the array)
+        daily_return = np.empty(len(portfolio_value))
+        daily_return[:1] = np.nan
+        np.subtract(portfolio_value[1:] / portfolio_value[:-1], 1, out=daily_return[1:])
         
-        for i in range(1, len(df)):
-            current_date = df.index[i]
-            current_price = df['Adj Close'].iloc[i]
-            current_signal = df['signal'].iloc[i]
-            
-            # For calculating daily returns
-            prev_portfolio_value = portfolio_value[-1]
-              # Check for take profit or stop loss if in position
-            if position > 0:
-                pnl_pct = (current_price - entry_price) / entry_price
-                days_held = (current_date - entry_date).days
-                
-                # Update trailing stop if using it and in profit
-                if self.use_trailing_stop and pnl_pct >= self.trailing_stop_activation:
-                    # Only update if current price gives a higher stop price than previous
-                    new_stop_price = current_price * (1 - self.trailing_stop_distance)
-                    if new_stop_price > trailing_stop_price:
-                        trailing_stop_price = new_stop_price
-                
-                # Take profit check
-                if pnl_pct >= self.take_profit_pct:
-                    # Sell at take profit
-                    profit = position * (current_price - entry_price)
-                    capital += position * current_price
-                    
-                    trade = {
-                        'entry_date': entry_date,
-                        'exit_date': current_date,
-                        'entry_price': entry_price,
-                        'exit_price': current_price,
-                        'shares': position,
-                        'pnl': profit,
-                        'pnl_pct': pnl_pct * 100,
-                        'exit_reason': 'take_profit'
-                    }
-                    all_trades.append(trade)
-                    
-                    position = 0
-                    trailing_stop_price = 0  # Reset trailing stop
-                    last_trade_date = current_date
-                
-                # Trailing stop hit (only if activated)
-                elif self.use_trailing_stop and trailing_stop_price > 0 and current_price <= trailing_stop_price:
-                    profit = position * (current_price - entry_price)
-                    capital += position * current_price
-                    
-                    trade = {
-                        'entry_date': entry_date,
-                        'exit_date': current_date,
-                        'entry_price': entry_price,
-                        'exit_price': current_price,
-                        'shares': position,
-                        'pnl': profit,
-                        'pnl_pct': pnl_pct * 100,
-                        'exit_reason': 'trailing_stop'
-                    }
-                    all_trades.append(trade)
-                    
-                    position = 0
-                    trailing_stop_price = 0  # Reset trailing stop
-                    last_trade_date = current_date
-                
-                # Regular stop loss check
-                elif pnl_pct <= -self.stop_loss_pct:
-                    # Sell at stop loss
-                    loss = position * (current_price - entry_price)
-                    capital += position * current_price
-                    
-                    trade = {
-                        'entry_date': entry_date,
-                        'exit_date': current_date,
-                        'entry_price': entry_price,
-                        'exit_price': current_price,
-                        'shares': position,
-                        'pnl': loss,
-                        'pnl_pct': pnl_pct * 100,
-                        'exit_reason': 'stop_loss'
-                    }
-                    all_trades.append(trade)
-                    
-                    position = 0
-                    trailing_stop_price = 0  # Reset trailing stop
-                    last_trade_date = current_date
-                
-                # For intraday, close position at end of day
-                elif intraday and days_held >= 1:
-                    profit = position * (current_price - entry_price)
-                    capital += position * current_price
-                    
-                    trade = {
-                        'entry_date': entry_date,
-                        'exit_date': current_date,
-                        'entry_price': entry_price,
-                        'exit_price': current_price,
-                        'shares': position,
-                        'pnl': profit,
-                        'pnl_pct': pnl_pct * 100,
-                        'exit_reason': 'day_close'
-                    }
-                    all_trades.append(trade)
-                    
-                    position = 0
-                    last_trade_date = current_date
-                
-                # For swing trading, consider max hold time
-                elif not intraday and days_held >= days_to_hold:
-                    profit = position * (current_price - entry_price)
-                    capital += position * current_price
-                    
-                    trade = {
-                        'entry_date': entry_date,
-                        'exit_date': current_date,
-                        'entry_price': entry_price,
-                        'exit_price': current_price,
-                        'shares': position,
-                        'pnl': profit,
-                        'pnl_pct': pnl_pct * 100,
-                        'exit_reason': 'time_exit'
-                    }
-                    all_trades.append(trade)
-                    
-                    position = 0
-                    last_trade_date = current_date
-              # Check for buy signal
-            if current_signal == 1 and position == 0:
-                # Only trade if enough time has passed since last trade (avoid overtrading)
-                if last_trade_date is None or (current_date - last_trade_date).days >= 1:
-                    # Calculate position size (% of capital)
-                    position_value = capital * self.position_size_pct
-                    position = int(position_value / current_price)
-                    
-                    if position > 0:
-                        entry_price = current_price
-                        entry_date = current_date
-                        trailing_stop_price = 0  # Reset trailing stop for new position
-                        capital -= position * current_price
-              # Check for sell signal
-            elif current_signal == -1 and position > 0:
-                profit = position * (current_price - entry_price)
-                capital += position * current_price
-                
-                trade = {
-                    'entry_date': entry_date,
-                    'exit_date': current_date,
-                    'entry_price': entry_price,
-                    'exit_price': current_price,
-                    'shares': position,
-                    'pnl': profit,
-                    'pnl_pct': ((current_price - entry_price) / entry_price) * 100,
-                    'exit_reason': 'signal'
-                }
-                all_trades.append(trade)
-                
-                position = 0
-                trailing_stop_price = 0  # Reset trailing stop
-                last_trade_date = current_date
-            
-            # Update trailing stop for long positions
-            if position > 0 and self.use_trailing_stop:
-                # Move trailing stop up if price increases
-                new_trailing_stop = current_price * (1 - self.trailing_stop_distance)
-                if new_trailing_stop > trailing_stop_price:
-                    trailing_stop_price = new_trailing_stop
-            
-            # Check for trailing stop loss
-            if position > 0 and current_price <= trailing_stop_price:
-                # Sell at trailing stop
-                loss = position * (current_price - entry_price)
-                capital += position * current_price
-                
-                trade = {
-                    'entry_date': entry_date,
-                    'exit_date': current_date,
-                    'entry_price': entry_price,
-                    'exit_price': current_price,
-                    'shares': position,
-                    'pnl': loss,
-                    'pnl_pct': ((current_price - entry_price) / entry_price) * 100,
-                    'exit_reason': 'trailing_stop'
-                }
-                all_trades.append(trade)
-                
-                position = 0
-                last_trade_date = current_date
-            
-            # Calculate portfolio value
-            portfolio_value.append(capital + (position * current_price))
-            dates.append(current_date)
-            
-        # Create a DataFrame of portfolio value over time
+        # Create a DataFrame of portfolio value over time, stored as portfolio_dtype
         portfolio_df = pd.DataFrame({
-            'Date': dates,
-            'Portfolio_Value': portfolio_value
-        })
-        portfolio_df.set_index('Date', inplace=True)
-        
-        # Calculate daily returns
-        portfolio_df['Daily_Return'] = portfolio_df['Portfolio_Value'].pct_change()
+            'Portfolio_Value': portfolio_value.astype(self.portfolio_dtype, copy=False),
+            'Daily_Return': daily_return.astype(self.portfolio_dtype, copy=False)
+        }, index=df.index.rename('Date'))
         
         # Convert trades to DataFrame
-        if all_trades:
-            trades_df = pd.DataFrame(all_trades)
-        else:
-            trades_df = pd.DataFrame(columns=['entry_date', 'exit_date', 'entry_price', 'exit_price', 
-                                             'shares', 'pnl', 'pnl_pct', 'exit_reason'])
+        trades_df = pd.DataFrame({
+            'entry_date': df.index[entry_idx[:n_trades]],
+            'exit_date': df.index[exit_idx[:n_trades]],
+            'entry_price': entry_price[:n_trades],
+            'exit_price': exit_price[:n_trades],
+            'shares': shares[:n_trades],
+            'pnl': pnl[:n_trades],
+            'pnl_pct': pnl_pct[:n_trades],
+            'exit_reason': np.array(EXIT_REASONS, dtype=object)[exit_reason[:n_trades]]
+        })
         
         # Save results
         self.portfolio = portfolio_df
         self.trades = trades_df
+        self._dd_cache = None
         
         return portfolio_df, trades_df
 
+    def fast_backtest(self, data, intraday=False, days_to_hold=None):
+        """Run the backtest and return only the summary metrics.
+
+        No portfolio or trades DataFrames are built (self.portfolio and self.trades
+        are left as they were), which keeps parameter searches cheap.
+        """
+        result = self._run_kernel(self.generate_signals(data), intraday, days_to_hold)
+        portfolio_value, pnl, n_trades = result[0], result[6], result[9]
+        return self._summary_metrics(portfolio_value, pnl, n_trades)
+
+    def _run_kernel(self, df, intraday, days_to_hold):
+        """Run the backtest kernel over a frame with signals and return its raw arrays."""
+        # Set default days_to_hold if None
+        if days_to_hold is None:
+            days_to_hold = 60  # Default to 60 days if not specified
+        
+        # Hand the per-bar loop raw arrays; the event logic lives in backtest_kernel,
+        # compiled separately for each trailing stop / intraday combination
+        prices = df['Adj Close'].to_numpy(dtype=np.float64)
+        signals = df['signal'].to_numpy(dtype=np.int8)
+        times = self._bar_times(df.index)
+        
+        return run_backtest_kernel(prices, signals, times, *self._kernel_params(intraday, days_to_hold))
+
+    @staticmethod
+    def _bar_times(index):
+        """Bar timestamps as int64 nanoseconds, as expected by the backtest kernels."""
+        return index.values.astype('datetime64[ns]').astype(np.int64)
+
+    def _kernel_params(self, intraday, days_to_hold):
+        """Scalar strategy settings in the order the backtest kernels take them."""
+        return (float(self.initial_capital), float(self.stop_loss_pct), float(self.take_profit_pct),
+                float(self.position_size_pct), bool(self.use_trailing_stop),
+                float(self.trailing_stop_activation), float(self.trailing_stop_distance),
+                bool(intraday), int(days_to_hold))
+
+    def _summary_metrics(self, portfolio_values, pnl, n_trades):
+        """Return the sweep metrics dict computed by the shared summary_metrics kernel."""
+        total_return, sharpe_ratio, max_drawdown, win_rate = summary_metrics(
+            portfolio_values, pnl, n_trades, float(self.initial_capital))
+        return {
+            'Total Return (%)': total_return,
+            'Sharpe Ratio': sharpe_ratio,
+            'Max Drawdown (%)': max_drawdown,
+            'Win Rate (%)': win_rate
+        }
+
     def calculate_metrics(self):
         """Calculate performance metrics of the strategy."""
         if len(self.portfolio) == 0:
@@ -304,12 +172,12 @@ class MovingAverageCrossover:
         portfolio_values = self.portfolio['Portfolio_Value'].values
         daily_returns = self.portfolio['Daily_Return'].dropna().values
         
-        # Calculate overall return
-        total_return = (portfolio_values[-1] - self.initial_capital) / self.initial_capital
+        # Calculate overall return (scalars in float64 whatever the portfolio dtype)
+        total_return = (np.float64(portfolio_values[-1]) - self.initial_capital) / self.initial_capital
         annualized_return = (1 + total_return) ** (252 / len(portfolio_values)) - 1
         
         # Calculate volatility (std dev of daily returns)
-        volatility = np.std(daily_returns) * np.sqrt(252)
+        volatility = np.std(daily_returns, dtype=np.float64) * np.sqrt(252)
         
         # Calculate Sharpe ratio (using 0% as risk-free rate for simplicity)
         sharpe_ratio = annualized_return / volatility if volatility > 0 else 0
@@ -319,10 +187,16 @@ class MovingAverageCrossover:
         
         # Calculate trade metrics
         if len(self.trades) > 0:
-            win_rate = len(self.trades[self.trades['pnl'] > 0]) / len(self.trades)
-            avg_win = self.trades[self.trades['pnl'] > 0]['pnl'].mean() if len(self.trades[self.trades['pnl'] > 0]) > 0 else 0
-            avg_loss = self.trades[self.trades['pnl'] < 0]['pnl'].mean() if len(self.trades[self.trades['pnl'] < 0]) > 0 else 0
-            profit_factor = abs(sum(self.trades[self.trades['pnl'] > 0]['pnl'])) / abs(sum(self.trades[self.trades['pnl'] < 0]['pnl'])) if sum(self.trades[self.trades['pnl'] < 0]['pnl']) < 0 else float('inf')
+            pnl = self.trades['pnl'].to_numpy()
+            wins = pnl[pnl > 0]
+            losses = pnl[pnl < 0]
+            gross_win = wins.sum()
+            gross_loss = -losses.sum()
+            
+            win_rate = len(wins) / len(pnl)
+            avg_win = wins.mean() if len(wins) > 0 else 0
+            avg_loss = losses.mean() if len(losses) > 0 else 0
+            profit_factor = gross_win / gross_loss if gross_loss > 0 else float('inf')
         else:
             win_rate = 0
             avg_win = 0
@@ -347,7 +221,13 @@ class MovingAverageCrossover:
         return metrics
     
     def calculate_drawdowns(self):
-        """Calculate drawdowns and maximum drawdown."""
+        """Calculate drawdowns and maximum drawdown.
+        
+        The result is cached per portfolio, since metrics, plots and reports all ask for it.
+        """
+        if self._dd_cache is not None and self._dd_cache[0] is self.portfolio:
+            return self._dd_cache[1]
+        
         portfolio_values = self.portfolio['Portfolio_Value'].values
         if len(portfolio_values) < 2: # Not enough data for drawdowns
             return [], 0, 0
@@ -357,43 +237,34 @@ class MovingAverageCrossover:
         
         # Calculate drawdown values: (running_max - current_value) / running_max
         # Initialize with zeros to handle cases where running_max is 0
-        drawdown_values = np.zeros_like(portfolio_values, dtype=float)
+        # (same dtype as the portfolio, so a float32 portfolio stays float32 here)
+        drawdown_values = np.zeros_like(portfolio_values)
         
-        # Avoid division by zero if running_max is 0
+        # Avoid division by zero if running_max is 0; compute in place instead of
+        # through fancy-indexed temporaries
         non_zero_mask = running_max != 0
-        drawdown_values[non_zero_mask] = (running_max[non_zero_mask] - portfolio_values[non_zero_mask]) / running_max[non_zero_mask]
+        np.subtract(running_max, portfolio_values, out=drawdown_values, where=non_zero_mask)
+        np.divide(drawdown_values, running_max, out=drawdown_values, where=non_zero_mask)
         
         # The drawdowns for plotting should correspond to self.portfolio.index[1:]
         # So we take drawdown_values starting from the second element
-        plot_drawdowns = list(drawdown_values[1:])
+        plot_drawdowns = drawdown_values[1:]
         
-        max_dd = np.max(drawdown_values) if len(drawdown_values) > 0 else 0
+        max_dd = np.float64(np.max(drawdown_values)) if len(drawdown_values) > 0 else 0
         
         # Calculate maximum drawdown duration
-        in_drawdown = False
-        current_dd_start_index = 0
-        max_dd_duration = 0
-        
-        # Iterate through the full drawdown_values (length N)
-        # A drawdown exists at point i if drawdown_values[i] > 0
-        for i in range(len(drawdown_values)): # Iterate N times
-            if drawdown_values[i] > 0 and not in_drawdown: # Start of a new drawdown
-                in_drawdown = True
-                current_dd_start_index = i
-            elif drawdown_values[i] == 0 and in_drawdown: # End of a drawdown
-                in_drawdown = False
-                # Duration is number of points in drawdown; if indices are i and j, duration is j-i+1
-                # Here, it ends at i-1, started at current_dd_start_index. So (i-1) - current_dd_start_index + 1 = i - current_dd_start_index
-                duration = i - current_dd_start_index 
-                if duration > max_dd_duration:
-                    max_dd_duration = duration
-        
-        # If still in drawdown at the end
-        if in_drawdown:
-            duration = len(drawdown_values) - current_dd_start_index
-            if duration > max_dd_duration:
-                max_dd_duration = duration
+        # A drawdown starts at a point with drawdown_values[i] > 0 and ends at the next
+        # point back at 0; other values (NaN) leave the current state unchanged
+        state = np.where(drawdown_values > 0, 1.0, np.where(drawdown_values == 0, 0.0, np.nan))
+        in_drawdown = pd.Series(state).ffill().fillna(0).to_numpy(dtype=np.int8)
+        
+        # Durations are the lengths of the runs of in_drawdown, found from its edges
+        edges = np.diff(np.concatenate(([0], in_drawdown, [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        max_dd_duration = int((ends - starts).max()) if len(starts) > 0 else 0
                 
+        self._dd_cache = (self.portfolio, (plot_drawdowns, max_dd, max_dd_duration))
         return plot_drawdowns, max_dd, max_dd_duration
 
     def analyze_market_periods(self, data, start_date, end_date):
@@ -434,15 +305,15 @@ class MovingAverageCrossover:
         
         # Ensure data has MA columns for plotting
         if 'short_ma' not in data.columns or 'long_ma' not in data.columns:
-            data = self.generate_signals(data.copy()) # Use a copy to avoid modifying original
+            data = self.generate_signals(data) # generate_signals works on its own copy
 
         # Create subplots
         fig, axs = plt.subplots(3, 1, figsize=(14, 18), gridspec_kw={'height_ratios': [2, 1, 1]})
         
         # Plot 1: Price and Moving Averages
-        axs[0].plot(data.index, data['Adj Close'], label='Price', alpha=0.7)
-        axs[0].plot(data.index, data['short_ma'], label=f'{self.short_window} MA', linewidth=1.5)
-        axs[0].plot(data.index, data['long_ma'], label=f'{self.long_window} MA', linewidth=1.5)
+        axs[0].plot(*self._plot_points(data['Adj Close']), label='Price', alpha=0.7)
+        axs[0].plot(*self._plot_points(data['short_ma']), label=f'{self.short_window} MA', linewidth=1.5)
+        axs[0].plot(*self._plot_points(data['long_ma']), label=f'{self.long_window} MA', linewidth=1.5)
         
         # Add buy/sell markers
         if len(self.trades) > 0:
@@ -460,7 +331,7 @@ class MovingAverageCrossover:
         axs[0].grid(True)
         
         # Plot 2: Portfolio Value
-        axs[1].plot(self.portfolio.index, self.portfolio['Portfolio_Value'], color='blue', linewidth=2)
+        axs[1].plot(*self._plot_points(self.portfolio['Portfolio_Value']), color='blue', linewidth=2)
         axs[1].set_title('Portfolio Value Over Time')
         axs[1].set_ylabel('Portfolio Value ($)')
         axs[1].grid(True)
@@ -468,7 +339,8 @@ class MovingAverageCrossover:
         # Plot 3: Drawdowns
         drawdowns, max_dd, _ = self.calculate_drawdowns()
         dd_series = pd.Series(index=self.portfolio.index[1:], data=drawdowns)
-        axs[2].fill_between(dd_series.index, 0, -dd_series.values * 100, color='red', alpha=0.3)
+        dd_dates, dd_values = self._plot_points(dd_series)
+        axs[2].fill_between(dd_dates, 0, -dd_values * 100, color='red', alpha=0.3)
         axs[2].set_title(f'Drawdowns (Max: {max_dd*100:.2f}%)')
         axs[2].set_ylabel('Drawdown (%)')
         axs[2].grid(True)
@@ -488,6 +360,30 @@ class MovingAverageCrossover:
             plt.show()
             return None
 
+    def _plot_points(self, series):
+        """Return (dates, values) of series to plot, at most about plot_max_points of them.
+
+        Long series keep the lowest and highest point of each bucket (plus both
+        ends), so peaks, troughs and the max drawdown still show up in the plot.
+        """
+        values = series.to_numpy(dtype=np.float64)
+        n = len(values)
+        if n <= self.plot_max_points:
+            return series.index, values
+        
+        # Two points per bucket; padding and NaNs never win the min/max
+        bucket = -(-n // (self.plot_max_points // 2))
+        n_buckets = -(-n // bucket)
+        padded = np.full(n_buckets * bucket, np.nan)
+        padded[:n] = values
+        buckets = padded.reshape(n_buckets, bucket)
+        missing = np.isnan(buckets)
+        starts = np.arange(n_buckets) * bucket
+        lows = starts + np.where(missing, np.inf, buckets).argmin(axis=1)
+        highs = starts + np.where(missing, -np.inf, buckets).argmax(axis=1)
+        keep = np.unique(np.concatenate(([0, n - 1], lows, highs)))
+        return series.index[keep], values[keep]
+
     def plot_interactive(self, data, save_path=None):
         """Create an interactive plot of strategy performance using Plotly."""
         if len(self.portfolio) == 0:
@@ -495,7 +391,7 @@ class MovingAverageCrossover:
 
         # Ensure data has MA columns for plotting
         if 'short_ma' not in data.columns or 'long_ma' not in data.columns:
-            data = self.generate_signals(data.copy()) # Use a copy to avoid modifying original
+            data = self.generate_signals(data) # generate_signals works on its own copy
             
         # Create subplots with 3 rows and 1 column
         fig = make_subplots(rows=3, cols=1, 
@@ -504,19 +400,22 @@ class MovingAverageCrossover:
                             row_heights=[0.5, 0.25, 0.25])
         
         # Plot 1: Price and Moving Averages
+        price_dates, prices = self._plot_points(data['Adj Close'])
+        short_dates, short_ma = self._plot_points(data['short_ma'])
+        long_dates, long_ma = self._plot_points(data['long_ma'])
         fig.add_trace(
-            go.Scatter(x=data.index, y=data['Adj Close'], name='Price', line=dict(color='black', width=1)),
+            go.Scatter(x=price_dates, y=prices, name='Price', line=dict(color='black', width=1)),
             row=1, col=1
         )
         
         fig.add_trace(
-            go.Scatter(x=data.index, y=data['short_ma'], name=f'{self.short_window} MA', 
+            go.Scatter(x=short_dates, y=short_ma, name=f'{self.short_window} MA', 
                       line=dict(color='blue', width=2)),
             row=1, col=1
         )
         
         fig.add_trace(
-            go.Scatter(x=data.index, y=data['long_ma'], name=f'{self.long_window} MA', 
+            go.Scatter(x=long_dates, y=long_ma, name=f'{self.long_window} MA', 
                       line=dict(color='orange', width=2)),
             row=1, col=1
         )
@@ -542,8 +441,9 @@ class MovingAverageCrossover:
             )
         
         # Plot 2: Portfolio Value
+        value_dates, values = self._plot_points(self.portfolio['Portfolio_Value'])
         fig.add_trace(
-            go.Scatter(x=self.portfolio.index, y=self.portfolio['Portfolio_Value'], 
+            go.Scatter(x=value_dates, y=values, 
                       name='Portfolio Value', line=dict(color='blue', width=2)),
             row=2, col=1
         )
@@ -551,9 +451,10 @@ class MovingAverageCrossover:
         # Plot 3: Drawdowns
         drawdowns, max_dd, _ = self.calculate_drawdowns()
         dd_series = pd.Series(index=self.portfolio.index[1:], data=drawdowns)
+        dd_dates, dd_values = self._plot_points(dd_series)
         
         fig.add_trace(
-            go.Scatter(x=dd_series.index, y=-dd_series.values*100, 
+            go.Scatter(x=dd_dates, y=-dd_values*100, 
                       name=f'Drawdown (Max: {max_dd*100:.2f}%)', 
                       fill='tozeroy', line=dict(color='red', width=1)),
             row=3, col=1
@@ -580,18 +481,18 @@ class MovingAverageCrossover:
             fig.show()
             return None
 
-    def generate_report(self, data, output_dir='reports', covid_period=('2020-02-01', '2020-04-30')):
-        """Generate a comprehensive backtest report."""
+    def generate_report(self, data, output_dir='reports', covid_period=('2020-02-01', '2020-04-30'),
+                        make_plots=True):
+        """Generate a comprehensive backtest report.
+
+        With make_plots=False the static and interactive plots are skipped, which
+        is most of the time spent when reports are generated in bulk.
+        """
         os.makedirs(output_dir, exist_ok=True)
         
         # Calculate metrics
         metrics = self.calculate_metrics()
 
-        # Ensure data has MA columns for plotting and analysis if needed elsewhere
-        data_for_plotting = data.copy()
-        if 'short_ma' not in data_for_plotting.columns or 'long_ma' not in data_for_plotting.columns:
-            data_for_plotting = self.generate_signals(data_for_plotting)
-        
         # Analyze COVID period
         covid_start, covid_end = covid_period
         # Pass the original data for period analysis, as it doesn't need MA columns
@@ -599,10 +500,16 @@ class MovingAverageCrossover:
         
         # Generate plots
         plot_path = os.path.join(output_dir, 'backtest_plot.png')
-        self.plot_results(data_for_plotting, save_path=plot_path) # Use augmented data
-        
         interactive_plot_path = os.path.join(output_dir, 'interactive_plot.html')
-        self.plot_interactive(data_for_plotting, save_path=interactive_plot_path) # Use augmented data
+        if make_plots:
+            # Compute the MA columns once here so neither plot has to recompute them;
+            # the plots only read the data, so no extra copy is needed
+            data_for_plotting = data
+            if 'short_ma' not in data.columns or 'long_ma' not in data.columns:
+                data_for_plotting = self.generate_signals(data)
+            
+            self.plot_results(data_for_plotting, save_path=plot_path) # Use augmented data
+            self.plot_interactive(data_for_plotting, save_path=interactive_plot_path) # Use augmented data
         
         # Generate trade log CSV
         trades_path = os.path.join(output_dir, 'trade_log.csv')
@@ -658,7 +565,8 @@ class MovingAverageCrossover:
             f.write("\nGENERATED REPORTS:\n")
             f.write(f"Trade Log: {os.path.basename(trades_path)}\n")
             f.write(f"Portfolio Value: {os.path.basename(portfolio_path)}\n")
-            f.write(f"Static Plot: {os.path.basename(plot_path)}\n")
-            f.write(f"Interactive Plot: {os.path.basename(interactive_plot_path)}\n")
+            if make_plots:
+                f.write(f"Static Plot: {os.path.basename(plot_path)}\n")
+                f.write(f"Interactive Plot: {os.path.basename(interactive_plot_path)}\n")
         
         return report_path